@@ -1,7 +1,11 @@
+import math
 import random
+from collections import defaultdict
 from collections.abc import Generator
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cache, lru_cache
+from itertools import chain
 from pathlib import Path
 
 import pygame as pg
@@ -19,6 +23,9 @@ SPAWN_X = [-USER_WIDTH, WIDTH]
 USER_SPEED = 100
 USER_ANGRY_SPEED = 200
 LIFT_ACCELERATION = 1600
+SKY_COLOR = pg.Color("skyblue")
+PASSED_COLOR, FAILED_COLOR = pg.Color("blue"), pg.Color("darkred")
+PATIENCE_COLORS = tuple((255, 51 * i, 51 * i) for i in range(6))  # red -> white
 
 get_actions = bind_controls(
     {
@@ -32,6 +39,16 @@ get_actions = bind_controls(
     }
 )
 
+# lift acceleration for each control action
+lift_controls = {
+    "pressed_up": lambda: -LIFT_ACCELERATION,
+    "pressed_down": lambda: LIFT_ACCELERATION,
+    "mouse_pressed": lambda: -LIFT_ACCELERATION if pg.mouse.get_pos()[1] < HEIGHT // 2 else LIFT_ACCELERATION,
+    "released_up": lambda: 0,
+    "released_down": lambda: 0,
+    "mouse_released": lambda: 0,
+}
+
 assets = asset_loader(Path(__file__).parent / "assets")
 
 
@@ -43,7 +60,7 @@ class PatienceLevel(Enum):
     CHILL = 30
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class User:
     """A lift user."""
 
@@ -55,6 +72,8 @@ class User:
     """How long the user will wait before complaining (in seconds)."""
     rect: pg.FRect | None = None
     """The rectangle representing the user on screen."""
+    side: int = 0
+    """The side of the lift the user approaches from (0 for left, 1 for right)."""
     lift_slot: int | None = None
     """The user's place on the lift."""
     waiting: bool = False
@@ -65,7 +84,7 @@ class User:
     """The image representing the user on screen."""
 
 
-@dataclass
+@dataclass(slots=True)
 class Lift:
     """A lift."""
 
@@ -81,10 +100,53 @@ class Lift:
     """The minimum absolute speed of the lift to be considered moving."""
     passengers: list[User | None] = field(default_factory=list)
     """The users currently on the lift."""
+    free_slots: list[int] = field(default_factory=list)
+    """The places on the lift that are not occupied."""
+    slot_x: tuple[int, ...] = ()
+    """The x-coordinate of the center of each place on the lift."""
     capacity: int = 4
     """The maximum number of users the lift can hold."""
 
 
+@cache
+def default_font(size: int) -> pg.Font:
+    """
+    Get the default font at the given size.
+    """
+    return pg.Font(None, size)
+
+
+@lru_cache(maxsize=256)
+def render_text(font: pg.Font, text: str, color: str) -> pg.Surface:
+    """
+    Render antialiased text, reusing the surface while the text is unchanged.
+    """
+    return font.render(text, True, color)
+
+
+@lru_cache(maxsize=512)
+def destination_marker(destination: int, shade: int, pointing_up: bool = False) -> pg.Surface:
+    """
+    Draw the marker showing a user's destination.
+
+    Args:
+        destination (int): The destination floor shown on the marker.
+        shade (int): The user's patience, from 0 (red) to 5 (white).
+        pointing_up (bool): Whether the marker points up instead of down.
+    Returns:
+        The marker surface.
+    """
+    marker = pg.Surface((41, 31), pg.SRCALPHA)
+    if pointing_up:
+        poly = [(0, 30), (20, 0), (40, 30)]
+    else:
+        poly = [(0, 0), (40, 0), (20, 30)]
+    pg.draw.polygon(marker, PATIENCE_COLORS[shade], poly)
+    label = render_text(default_font(30), f"{destination:d}", "black")
+    marker.blit(label, label.get_rect(midtop=(20, 0)))
+    return marker
+
+
 def floor_y(i: int, num_floors: int) -> int:
     """
     Get the y-coordinate of the bottom of a floor.
@@ -101,16 +163,18 @@ def users(max_floor: int = 10) -> Generator[User]:
     Yields:
         user
     """
-    floors = list(range(max_floor))
+    patience_levels = tuple(level.value for level in PatienceLevel)
 
     while True:
-        start_floor = random.choice(floors)
-        destination = random.choice(list(set(floors) - {start_floor}))
-        patience = random.choice(list(PatienceLevel)).value
+        start_floor = random.randrange(max_floor)
+        # pick any floor but the start floor
+        destination = random.randrange(max_floor - 1)
+        destination += destination >= start_floor
+        patience = random.choice(patience_levels)
         side = random.choice((0, 1))
         rect = pg.FRect(SPAWN_X[side], (max_floor - start_floor) * FLOOR_HEIGHT - USER_HEIGHT, USER_WIDTH, USER_HEIGHT)
-        image = assets(f"user{random.choice(range(7)):02d}").copy()
-        yield User(start_floor, destination, patience, rect, image=image)
+        image = assets(f"user{random.randrange(7):02d}")
+        yield User(start_floor, destination, patience, rect, side=side, image=image)
 
 
 @dataclass(kw_only=True)
@@ -120,10 +184,13 @@ class GameState:
     building_height: int = 0
     camera: pg.FRect = field(default_factory=lambda: pg.FRect(0, 0, WIDTH, HEIGHT))
     complaints: int = 0
+    floor_bottoms: tuple[int, ...] = ()
     level_started: bool = False
+    leaving_users: list[User] = field(default_factory=list)
     lift_sound: pg.mixer.Sound | None = None
     lift_start_delay: float = 0.0
     num_floors: int = 8
+    queues: dict[tuple[int, int], list[User]] = field(default_factory=lambda: defaultdict(list))
     served_users: int = 0
     time_to_next_user: float = 0.0
     user_stream: Generator[User] | None = None
@@ -134,6 +201,15 @@ def play() -> SceneFn:
     arco_font = assets("arco")
     arco_font.set_point_size(50)
 
+    sky_image = assets("background")
+    sky_rect = sky_image.get_rect()
+    lift_image = assets("lift")
+    gauge_image = assets("gauge")
+    gauge_rect = gauge_image.get_rect(bottom=HEIGHT)
+    start_sound = assets("lift_start")
+    stop_sound = assets("lift_stop")
+    moving_sound = assets("lift_moving")
+
     state = GameState()
 
     def start_level(shared_state: dict):
@@ -146,21 +222,28 @@ def play() -> SceneFn:
         state.time_to_next_user = random.normalvariate(state.avg_arrival_time)
         state.user_stream = users(state.num_floors)
         state.building_height = building_height = state.num_floors * FLOOR_HEIGHT
+        # one entry per floor, plus the top of the building
+        state.floor_bottoms = tuple(floor_y(i, state.num_floors) for i in range(state.num_floors + 1))
 
         state.lift = lift = Lift()
         lift.passengers = [None] * lift.capacity
-        lift.rect.bottom = state.num_floors * FLOOR_HEIGHT
+        lift.free_slots = list(range(lift.capacity))
+        slot_width = (lift.rect.width - 16) // lift.capacity
+        lift.slot_x = tuple(lift.rect.x + 8 + i * slot_width + slot_width // 2 for i in range(lift.capacity))
+        lift.rect.bottom = state.floor_bottoms[0]
 
         num_floors = state.num_floors
         bg = pg.Surface((WIDTH, building_height + FLOOR_HEIGHT), pg.SRCALPHA)
         bg.fill((0, 0, 0, 0))
         rect = pg.Rect(0, 0, WIDTH, FLOOR_HEIGHT)
+        floors = []
         for i in range(num_floors):
-            floor_rect = rect.move(0, floor_y(i + 1, num_floors))
-            bg.blit(assets(f"floor{random.choice(range(4)):02d}"), floor_rect)
-            number = pg.Font(None, 30).render(f"{i:d}", True, "white")
-            bg.blit(number, number.get_rect(right=lift.rect.x - 10, top=floor_rect.top + 10))
-        state.background = bg
+            floor_rect = rect.move(0, state.floor_bottoms[i + 1])
+            floors.append((assets(f"floor{random.choice(range(4)):02d}"), floor_rect))
+            number = render_text(default_font(30), f"{i:d}", "white")
+            floors.append((number, number.get_rect(right=lift.rect.x - 10, top=floor_rect.top + 10)))
+        bg.fblits(floors)
+        state.background = bg.convert_alpha()
 
         state.level_started = True
 
@@ -177,42 +260,26 @@ def play() -> SceneFn:
         lift = state.lift
 
         for action in get_actions(events):
-            match action:
-                case "pressed_up":
-                    lift.acceleration.y = -LIFT_ACCELERATION
-                case "pressed_down":
-                    lift.acceleration.y = LIFT_ACCELERATION
-
-                case "mouse_pressed" if pg.mouse.get_pos()[1] < HEIGHT // 2:
-                    lift.acceleration.y = -LIFT_ACCELERATION
-                case "mouse_pressed" if pg.mouse.get_pos()[1] >= HEIGHT // 2:
-                    lift.acceleration.y = LIFT_ACCELERATION
-
-                case "released_up" | "released_down":
-                    lift.acceleration.y = 0
-
-                case "mouse_released":
-                    lift.acceleration.y = 0
-
-                case "exit":
-                    return main_menu()
+            if action == "exit":
+                return main_menu()
+            if control := lift_controls.get(action):
+                lift.acceleration.y = control()
 
         lift_was_stopped = abs(lift.velocity.y) < lift.min_speed
 
-        lift.velocity += lift.acceleration * delta_time
+        # the lift only moves vertically
+        lift.velocity.y += lift.acceleration.y * delta_time
         if abs(lift.velocity.y) < lift.min_speed:
             lift.velocity.y = 0
-        if abs(lift.velocity.y) > lift.max_speed:
-            lift.velocity.y = lift.max_speed * (1 if lift.velocity.y > 0 else -1)
-        lift.velocity *= SPEED_DAMPING
+        lift.velocity.y = math.copysign(min(abs(lift.velocity.y), lift.max_speed), lift.velocity.y)
+        lift.velocity.y *= SPEED_DAMPING
         lift.rect.y += lift.velocity.y * delta_time
         lift.rect.bottom = min(state.building_height, lift.rect.bottom)
         lift.rect.top = max(lift.rect.top, 0)
-        lift_floor = (state.building_height - lift.rect.bottom) // FLOOR_HEIGHT
+        lift_floor, offset = divmod(state.building_height - lift.rect.bottom, FLOOR_HEIGHT)
 
         # snap to floors
         if abs(lift.velocity.y) < MAX_SNAP_SPEED:
-            offset = (state.building_height - lift.rect.bottom) % FLOOR_HEIGHT
             if abs(FLOOR_HEIGHT // 2 - offset) > SNAP_THRESHOLD:
                 if offset < FLOOR_HEIGHT // 2:
                     lift.rect.bottom += offset
@@ -226,25 +293,25 @@ def play() -> SceneFn:
             if lift_was_stopped:
                 if state.lift_sound:
                     state.lift_sound.stop()
-                state.lift_sound = assets("lift_start")
+                state.lift_sound = start_sound
                 state.lift_sound.play()
                 state.lift_start_delay = state.lift_sound.get_length()
 
             else:
                 # stopping
                 if lift.acceleration.y == 0:
-                    if state.lift_sound != assets("lift_stop"):
+                    if state.lift_sound is not stop_sound:
                         if state.lift_sound:
                             state.lift_sound.stop()
-                        state.lift_sound = assets("lift_stop")
+                        state.lift_sound = stop_sound
                         state.lift_sound.play()
 
                 # moving
                 elif state.lift_start_delay <= 0:
-                    if state.lift_sound != assets("lift_moving"):
+                    if state.lift_sound is not moving_sound:
                         if state.lift_sound:
                             state.lift_sound.stop()
-                        state.lift_sound = assets("lift_moving")
+                        state.lift_sound = moving_sound
                         state.lift_sound.play(-1)
 
                 # wait until start sound is done
@@ -252,164 +319,187 @@ def play() -> SceneFn:
                     state.lift_start_delay -= delta_time
 
         # update camera to follow lift
-        camera.center = pg.Vector2(camera.center).lerp(lift.rect.center, 0.1)
-        camera.bottom = min(camera.bottom, state.num_floors * FLOOR_HEIGHT)
-
-        screen.fill("skyblue")
-        screen.blit(
-            assets("background"),
-            assets("background").get_rect(bottom=HEIGHT - camera.y // 3)
+        (camera_x, camera_y), (lift_x, lift_y) = camera.center, lift.rect.center
+        camera.center = (camera_x * 0.9 + lift_x * 0.1, camera_y * 0.9 + lift_y * 0.1)
+        camera.bottom = min(camera.bottom, state.building_height)
+
+        # the sky image is opaque, so only fill what it doesn't cover
+        sky_rect.bottom = HEIGHT - camera.y // 3
+        if sky_rect.top > 0:
+            screen.fill(SKY_COLOR, (0, 0, WIDTH, sky_rect.top))
+        if sky_rect.bottom < HEIGHT:
+            screen.fill(SKY_COLOR, (0, sky_rect.bottom, WIDTH, HEIGHT - sky_rect.bottom))
+        screen.blits(
+            [
+                (sky_image, sky_rect),
+                (state.background, (0, 0), camera),
+                # (assets("construction"), (0, -FLOOR_HEIGHT - camera.y)),
+                (lift_image, (lift.rect.x, lift.rect.y - camera.top)),
+            ],
+            doreturn=False,
         )
-        screen.blit(state.background, (0, 0), area=camera)
-        # screen.blit(assets("construction"), (0, -FLOOR_HEIGHT - camera.y))
-        screen.blit(assets("lift"), lift.rect.move(0, -camera.top))
 
         # spawn new users
         state.time_to_next_user -= delta_time
         if state.time_to_next_user <= 0:
             new_user = next(state.user_stream)
-            side = int(new_user.rect.centerx < lift.rect.centerx)
             state.all_users.append(new_user)
+            state.queues[new_user.floor, new_user.side].append(new_user)
             state.time_to_next_user = random.normalvariate(state.avg_arrival_time)
 
-        users_to_remove = []
+        # the lift doesn't move while users are updated
+        lift_left, lift_right = lift.rect.left, lift.rect.right
+        lift_centerx, lift_bottom = lift.rect.centerx, lift.rect.bottom
+
+        # the floor the lift is stopped at, if any
+        stopped_at = None
+        if abs(lift.velocity.y) < 5:
+            nearest_floor = round((state.building_height - lift_bottom) / FLOOR_HEIGHT)
+            if abs(lift_bottom - state.floor_bottoms[nearest_floor]) < 5:
+                stopped_at = nearest_floor
+
+        # distance users walk/storm off this frame
+        walk_step = USER_SPEED * delta_time
+        storm_step = USER_ANGRY_SPEED * delta_time
+
+        # names looked up for every user, bound once per frame
+        queues, floor_bottoms = state.queues, state.floor_bottoms
+        left_queue_limits, right_queue_limits = (lift_right, WIDTH), (lift_left, 0)
+        exit_left, exit_right = -USER_WIDTH, WIDTH + USER_WIDTH
+        last_x = WIDTH - USER_WIDTH
+
+        started_leaving = []
         for user in state.all_users:
-            current_floor = (state.building_height - user.rect.bottom) // FLOOR_HEIGHT
-            destination_floor = state.building_height - user.destination * FLOOR_HEIGHT
-            at_destination = abs(lift.rect.bottom - destination_floor) < 5
 
-            # user has boarded the lift/is leaving
+            # user has boarded the lift
             if user.lift_slot is not None:
 
-                lift_is_stopped = abs(lift.velocity.y) < 5
-                user.satisfied |= at_destination and lift_is_stopped
+                user.satisfied |= user.destination == stopped_at
 
                 if user.satisfied:
-                    if lift.passengers[user.lift_slot] is user:
-                        lift.passengers[user.lift_slot] = None
-
-                    # move the user off the screen
-                    offset = user.rect.centerx - lift.rect.centerx
-                    direction = 1 if offset > 0 else -1 if offset < 0 else random.choice((-1, 1))
-                    user.rect.x += direction * USER_SPEED * delta_time
+                    lift.passengers[user.lift_slot] = None
+                    lift.free_slots.append(user.lift_slot)
+                    started_leaving.append(user)
 
                 else:
 
                     # ensure the user is on the lift
-                    user.rect.bottom = lift.rect.bottom
+                    user.rect.bottom = lift_bottom
 
                     # move to their lift slot
-                    slot_width = (lift.rect.width - 16) // lift.capacity
-                    slot_x = lift.rect.x + 8 + user.lift_slot * slot_width + slot_width // 2
+                    slot_x = lift.slot_x[user.lift_slot]
 
                     if abs(user.rect.centerx - slot_x) > 1:
                         direction = 1 if user.rect.centerx < slot_x else -1
-                        user.rect.x += direction * USER_SPEED * delta_time
+                        user.rect.x += direction * walk_step
                     else:
                         user.rect.centerx = slot_x
 
-                # if user has left the screen, update score
-                if not 0 <= user.rect.x <= WIDTH - USER_WIDTH:
-                    users_to_remove.append(user)
-                    state.served_users += 1
-
             # user is arriving/waiting for the lift
             else:
 
                 # ensure the user is on the floor
-                user.rect.bottom = state.building_height - current_floor * FLOOR_HEIGHT
-
-                if user.patience:
-
-                    # move towards the lift
-                    side = int(user.rect.centerx < lift.rect.centerx)
-                    user.rect.x += [-1, 1][side] * USER_SPEED * delta_time
-
-                    # # move them to the back of the queue for the side they are on
-                    others = [
-                        other for other in state.all_users
-                        if (
-                            other.lift_slot is None
-                            and other.floor == user.floor
-                            and other != user
-                            and other.patience > 0
-                        )
-                    ]
-                    if user.rect.centerx < lift.rect.centerx:
-                        end_of_queue = min(
-                            lift.rect.right,
-                            *(
-                                other.rect.left for other in others
-                                if user.rect.right < other.rect.left < lift.rect.left
-                            ),
-                            WIDTH,
-                        )
-                        if end_of_queue <= user.rect.right + 5:
-                            user.rect.right = end_of_queue - 5
-                            user.waiting = True
+                user.rect.bottom = floor_bottoms[user.floor]
+
+                # move towards the lift
+                side = int(user.rect.centerx < lift_centerx)
+                user.rect.x += walk_step if side else -walk_step
+
+                # move them to the back of the queue for the side they are on
+                others = queues[user.floor, user.side]
+                if user.rect.centerx < lift_centerx:
+                    end_of_queue = min(chain(
+                        left_queue_limits,
+                        (
+                            other.rect.left for other in others
+                            if user.rect.right < other.rect.left < lift_left
+                        ),
+                    ))
+                    if end_of_queue <= user.rect.right + 5:
+                        user.rect.right = end_of_queue - 5
+                        user.waiting = True
+                else:
+                    end_of_queue = max(chain(
+                        right_queue_limits,
+                        (
+                            other.rect.right for other in others
+                            if user.rect.left > other.rect.right > lift_right
+                        ),
+                    ))
+                    if end_of_queue >= user.rect.left - 5:
+                        user.rect.left = end_of_queue + 5
+                        user.waiting = True
+
+                # if the lift is not on their floor or full, don't let them board
+                if lift_floor != user.floor or not lift.free_slots:
+                    if side:
+                        user.rect.right = min(user.rect.right, lift_left - 5)
                     else:
-                        end_of_queue = max(
-                            lift.rect.left,
-                            *(
-                                other.rect.right for other in others
-                                if user.rect.left > other.rect.right > lift.rect.right
-                            ),
-                            0,
-                        )
-                        if end_of_queue >= user.rect.left - 5:
-                            user.rect.left = end_of_queue + 5
-                            user.waiting = True
-
-                    # if the lift is not on their floor or full, don't let them board
-                    if lift_floor != user.floor or all(lift.passengers):
-                        if side:
-                            user.rect.right = min(user.rect.right, lift.rect.left - 5)
-                        else:
-                            user.rect.left = max(user.rect.left, lift.rect.right + 5)
- 
-                    # board the lift if it is on their floor
-                    elif lift.rect.left <= user.rect.centerx <= lift.rect.right:
-                        slots = set(range(lift.capacity))
-                        occupied = {i for i, p in enumerate(lift.passengers) if p}
-                        available = slots - occupied
-                        user.lift_slot = random.choice(list(available))
-                        user.rect.bottom = lift.rect.bottom
-                        lift.passengers[user.lift_slot] = user
-
-                    if user.waiting:
-                        if user.patience:
-                            user.patience = max(0, user.patience - delta_time)
-                            if user.patience == 0:
-                                assets(f"huff{random.choice(range(2)):02d}").play()
+                        user.rect.left = max(user.rect.left, lift_right + 5)
+
+                # board the lift if it is on their floor
+                elif lift_left <= user.rect.centerx <= lift_right:
+                    user.lift_slot = lift.free_slots.pop(random.randrange(len(lift.free_slots)))
+                    user.rect.bottom = lift_bottom
+                    lift.passengers[user.lift_slot] = user
+                    queues[user.floor, user.side].remove(user)
+
+                if user.waiting:
+                    user.patience = max(0, user.patience - delta_time)
+                    if user.patience == 0:
+                        assets(f"huff{random.choice(range(2)):02d}").play()
+                        if user.lift_slot is None:
+                            queues[user.floor, user.side].remove(user)
+                            started_leaving.append(user)
+
+        if started_leaving:
+            leaving = set(started_leaving)
+            state.all_users = [user for user in state.all_users if user not in leaving]
+            state.leaving_users.extend(started_leaving)
+
+        # users who are leaving only need to walk off screen
+        users_to_remove = []
+        for user in state.leaving_users:
 
-                else:
+            # user has been delivered
+            if user.satisfied:
+                offset = user.rect.centerx - lift_centerx
+                direction = math.copysign(1, offset) if offset else random.choice((-1, 1))
+                user.rect.x += direction * walk_step
 
-                    # user has run out of patience, move off screen
-                    direction = -1 if user.rect.centerx < lift.rect.centerx else 1
-                    user.rect.x += direction * USER_ANGRY_SPEED * delta_time
+                # if user has left the screen, update score
+                if not 0 <= user.rect.x <= last_x:
+                    users_to_remove.append(user)
+                    state.served_users += 1
 
-                    if not -USER_WIDTH < user.rect.centerx < WIDTH + USER_WIDTH:
-                        users_to_remove.append(user)
-                        state.complaints += 1
+            # user has run out of patience
+            else:
+                direction = -1 if user.rect.centerx < lift_centerx else 1
+                user.rect.x += direction * storm_step
 
-            # user color indicates patience level: white -> red
-            i = 1 if user.patience > 5 else user.patience / 6
+                if not exit_left < user.rect.centerx < exit_right:
+                    users_to_remove.append(user)
+                    state.complaints += 1
+
+        sprites = []
+        for user in chain(state.all_users, state.leaving_users):
+
+            # marker color indicates patience level: white -> red
             cx, cy = user.rect.centerx, min(HEIGHT, max(0, user.rect.top - camera.top))
-            ch = 30
-            poly = [(cx - 20, cy), (cx + 20, cy), (cx, cy + ch)]
-            if cy == 0:
-                poly = [(cx - 20, ch), (cx, 0), (cx + 20, ch)]
-            elif cy == HEIGHT:
-                poly = [(cx - 20, HEIGHT - ch), (cx + 20, HEIGHT - ch), (cx, HEIGHT)]
-                cy = HEIGHT - ch
-
-            label = pg.Font(None, 30).render(f"{user.destination:d}", True, "black")
-            pg.draw.polygon(screen, (255, int(255 * i), int(255 * i)), poly)
-            screen.blit(label, label.get_rect(midtop=(cx, cy)))
-            screen.blit(user.image, user.rect.move(0, -camera.top))
-
-        while users_to_remove:
-            state.all_users.remove(users_to_remove.pop())
+            if cy == HEIGHT:
+                cy = HEIGHT - 30
+            marker = destination_marker(user.destination, min(5, int(user.patience)), cy == 0)
+            sprites.append((marker, (cx - 20, cy)))
+
+            # only draw users the camera can see
+            if camera.colliderect(user.rect):
+                sprites.append((user.image, (user.rect.x, user.rect.y - camera.top)))
+
+        screen.fblits(sprites)
+
+        if users_to_remove:
+            removed = set(users_to_remove)
+            state.leaving_users = [user for user in state.leaving_users if user not in removed]
 
         # draw clock
         time = "{0:02d}:{1:02d}".format(*divmod(int(shared_state["time_to_next_level"]), 60))
@@ -423,7 +513,7 @@ def play() -> SceneFn:
             return end_level()
 
         # draw score
-        screen.blit(assets("gauge"), assets("gauge").get_rect(bottom=HEIGHT))
+        screen.blit(gauge_image, gauge_rect)
         outline_text(screen, f"{state.served_users:04d}", arco_font, "white", move_to={"left": 180, "bottom": HEIGHT - 20})
         outline_text(screen, f"{state.complaints:04d}", arco_font, "white", move_to={"right": 620, "bottom": HEIGHT - 20})
 
@@ -439,9 +529,9 @@ def outline_text(
     outline_color: str = "black",
     outline_width: int = 2
 ) -> None:
-    text_img = font.render(text, True, text_color)
+    text_img = render_text(font, text, text_color)
     rect = text_img.get_rect(**move_to)
-    shadow = font.render(text, True, outline_color)
+    shadow = render_text(font, text, outline_color)
     for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
         surface.blit(shadow, rect.move(dx * outline_width, dy * outline_width))
     surface.blit(text_img, rect)
@@ -474,7 +564,7 @@ def end_level() -> SceneFn:
         total = served + shared_state.get("complaints", 0)
         if total > 0:
             star_rating = max(0, min(3, round((served / total) * 3)))
-            screen.fill("blue" if star_rating else "darkred")
+            screen.fill(PASSED_COLOR if star_rating else FAILED_COLOR)
             if star_rating == 3 and not state["applauded"]:
                 assets("applause").play()
                 state["applauded"] = True
@@ -485,7 +575,7 @@ def end_level() -> SceneFn:
                 "white",
                 move_to={"centerx": screen_rect.centerx, "top": 100}
             )
-            text = pg.Font(None, 30).render(f"You served {served} / {total} users!", True, "white")
+            text = render_text(default_font(30), f"You served {served} / {total} users!", "white")
             screen.blit(text, text.get_rect(centerx=screen_rect.centerx, top=200))
             for i in range(3):
                 rect = assets("star").get_rect(centerx=screen_rect.centerx - 50 + i * 50, top=300)
@@ -494,7 +584,7 @@ def end_level() -> SceneFn:
                 else:
                     screen.blit(assets("star_no"), rect)
 
-        text = pg.Font(None, 30).render("Click or press SPACE to continue", True, "white")
+        text = render_text(default_font(30), "Click or press SPACE to continue", "white")
         screen.blit(text, text.get_rect(centerx=screen_rect.centerx, bottom=screen_rect.bottom - 50))
 
     return _scene
@@ -517,7 +607,7 @@ def main_menu() -> SceneFn:
                 return play()
 
         screen.blit(assets("title"), (0, 0))
-        text = pg.Font(None, 40).render("Click or press any key to start", True, "white")
+        text = render_text(default_font(40), "Click or press any key to start", "white")
         screen.blit(text, text.get_rect(centerx=WIDTH // 2, bottom=HEIGHT - 50))
 
     return _scene
@@ -1,4 +1,5 @@
 import asyncio
+import sys
 from collections.abc import Callable, Generator, Hashable
 from functools import lru_cache
 from pathlib import Path
@@ -41,21 +42,27 @@ async def game(
             current_scene = next_scene
 
         pg.display.flip()
-        await asyncio.sleep(0)
+
+        # only the browser build needs to hand control back between frames
+        if sys.platform == "emscripten":
+            await asyncio.sleep(0)
 
 
 def bind_controls(mapping: dict[str, list[pg.Event]]):
+    # index actions by event type and the values of the attributes bound for that type
+    attrs_by_type: dict[int, tuple[str, ...]] = {}
+    actions: dict[tuple, str] = {}
+    for action, inputs in mapping.items():
+        for input_ in filter(None, inputs):
+            attrs = attrs_by_type.setdefault(input_.type, tuple(sorted(input_.__dict__)))
+            if tuple(sorted(input_.__dict__)) != attrs:
+                raise ValueError(f"Inputs of the same type must bind the same attributes: {input_}")
+            actions.setdefault((input_.type, *(input_.__dict__[attr] for attr in attrs)), action)
 
     def get_action(event: pg.Event) -> str | None:
-        for action, inputs in mapping.items():
-            if any(
-                input_
-                and event.type == input_.type
-                and event.__dict__.items() >= input_.__dict__.items()
-                for input_ in inputs
-            ):
-                return action
-        return None
+        if (attrs := attrs_by_type.get(event.type)) is None:
+            return None
+        return actions.get((event.type, *(getattr(event, attr, None) for attr in attrs)))
 
     def map_events_to_actions(events: list[pg.Event]) -> list[str]:
         return [action for event in events if (action := get_action(event))]
@@ -63,6 +70,14 @@ def bind_controls(mapping: dict[str, list[pg.Event]]):
     return map_events_to_actions
 
 
+def load_image(path: Path) -> pg.Surface:
+    image = pg.image.load(path)
+    # only keep per-pixel alpha for images that have it, opaque blits are faster
+    if image.get_flags() & pg.SRCALPHA:
+        return image.convert_alpha()
+    return image.convert()
+
+
 def asset_loader(path: Path):
     if not path.is_dir():
         raise ValueError(f"Path does not exist: {path}")
@@ -76,7 +91,7 @@ def asset_loader(path: Path):
             raise LookupError(f"Asset not found: {path / name}")
 
         if load_fn := {
-            **{_: lambda path: pg.image.load(path).convert_alpha() for _ in [".png"]},
+            **{_: load_image for _ in [".png"]},
             **{_: pg.mixer.Sound for _ in [".ogg"]},
             **{_: lambda path: pg.Font(path, 20) for _ in [".ttf"]},
         }.get(asset_path.suffix.lower()):